@@ -14,6 +14,7 @@ from datetime import datetime
 import io
 import sys
 import PIL.Image
+from utils.upload_guard import GuardedRequest, MAX_REQUEST_SIZE
 
 # 1. Fix Windows console encoding
 sys.stdout.reconfigure(encoding='utf-8')
@@ -112,6 +113,8 @@ def generate_with_retry(model, prompt_parts):
 initialize_any_key()
 
 app = Flask(__name__)
+app.request_class = GuardedRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_SIZE
 app.secret_key = os.getenv("SECRET_KEY", "skillbridge-hackathon-secret-2024")
 app.config['SESSION_TYPE'] = 'filesystem'
 app.config['SESSION_PERMANENT'] = True
@@ -179,9 +182,8 @@ def get_categories():
         categories.add(role_data.get('category', 'Other'))
     return sorted(list(categories))
 
-def extract_text_from_file(file):
-    filename = file.filename.lower()
-    if filename.endswith('.pdf'):
+def extract_text_from_file(file, kind):
+    if kind == 'pdf':
         try:
             reader = PyPDF2.PdfReader(file)
             text = ""
@@ -190,16 +192,16 @@ def extract_text_from_file(file):
             return text
         except Exception as e:
             raise ValueError(f"Error reading PDF: {str(e)}")
-    elif filename.endswith(('.docx', '.doc')):
+    elif kind == 'docx':
         try:
             import docx
             doc = docx.Document(file)
             return '\n'.join([para.text for para in doc.paragraphs])
         except ImportError:
-            return "Error: python-docx library not installed."
+            raise ValueError("Error: python-docx library not installed.")
         except Exception as e:
-            return f"Error reading DOCX: {str(e)}"
-    elif filename.endswith(('.jpg', '.jpeg', '.png', '.webp')):
+            raise ValueError(f"Error reading DOCX: {str(e)}")
+    elif kind == 'image':
         try:
             image = PIL.Image.open(file)
             prompt = "Analyze this image of a resume and extract all the text content from it verbatim. Organize it clearly."
@@ -337,8 +339,15 @@ def analyze():
     
     if not role or file.filename == '': return jsonify({"error": "Missing data"}), 400
     
+    # The upload was size-checked, sniffed and hashed while it streamed in.
+    kind = file.stream.verify()
+    
     try:
-        resume_text = extract_text_from_file(file)
+        cache_key = f"resume_text:{file.stream.sha256}"
+        resume_text = cache.get(cache_key)
+        if resume_text is None:
+            resume_text = extract_text_from_file(file, kind)
+            cache.set(cache_key, resume_text, timeout=3600)
         if len(resume_text.strip()) < 50: return render_template('error.html', error="Resume empty/unreadable", suggestion="Upload clear file")
         session['analysis_id'] = str(uuid.uuid4())
         analysis = get_ai_feedback(resume_text, role, jd_text)
@@ -415,6 +424,12 @@ def get_categories_api():
 @app.errorhandler(404)
 def not_found(e): return render_template('error.html', error="Page not found"), 404
 
+@app.errorhandler(413)
+def too_large(e): return render_template('error.html', error=e.description, suggestion="Upload a smaller file"), 413
+
+@app.errorhandler(415)
+def unsupported_type(e): return render_template('error.html', error=e.description, suggestion="Upload a PDF, DOCX, or Image file"), 415
+
 if __name__ == '__main__':
     print("\n" + "="*60)
     print(f"🚀 SKILLBRIDGE AI - FINAL SEQUENTIAL LOGIC ACTIVATED")
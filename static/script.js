@@ -39,7 +39,6 @@ document.addEventListener("DOMContentLoaded", function () {
         const validExtensions = [
           ".pdf",
           ".docx",
-          ".doc",
           ".jpg",
           ".jpeg",
           ".png",
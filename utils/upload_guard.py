@@ -0,0 +1,120 @@
+import hashlib
+from tempfile import SpooledTemporaryFile
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge, UnsupportedMediaType
+
+MB = 1024 * 1024
+
+# --- PER-FORMAT LIMITS ---
+# Each upload is checked against the limit of the format its magic bytes reveal.
+# Keep these in line with the 10MB the upload form advertises and checks.
+UPLOAD_LIMITS = {
+    "pdf": 10 * MB,
+    "docx": 10 * MB,
+    "image": 10 * MB,
+}
+
+# Hard cap for the whole request body (largest file + room for the form fields).
+MAX_REQUEST_SIZE = max(UPLOAD_LIMITS.values()) + 256 * 1024
+
+# Uploads bigger than this are spooled to disk instead of being kept in RAM.
+SPOOL_THRESHOLD = 512 * 1024
+
+# Which format family each accepted filename suffix belongs to.
+EXTENSION_KINDS = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".png": "image",
+    ".webp": "image",
+}
+
+SNIFF_BYTES = 12
+
+UNSUPPORTED_MESSAGE = "Unsupported file format. Please upload PDF, DOCX, or Image (JPG/PNG)."
+
+
+def sniff_kind(head):
+    """Detects the format family from the first bytes of a file."""
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    if head.startswith((b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")):
+        return "image"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image"
+    return None
+
+
+def expected_kind(filename):
+    """Maps a filename to its format family, or None if the suffix is not accepted."""
+    filename = (filename or "").lower()
+    for suffix, kind in EXTENSION_KINDS.items():
+        if filename.endswith(suffix):
+            return kind
+    return None
+
+
+class GuardedUpload(SpooledTemporaryFile):
+    """
+    Spooled upload container that validates the file while it is being written.
+    1. Sniffs the magic bytes of the first chunk and rejects unknown formats.
+    2. Enforces the per-format size limit as the bytes arrive.
+    3. Hashes the content in the same pass so callers can cache by `sha256`.
+    """
+
+    def __init__(self, filename=None):
+        super().__init__(max_size=SPOOL_THRESHOLD, mode="rb+")
+        self.filename = filename
+        self.expected = expected_kind(filename)
+        self.kind = None
+        self.size = 0
+        self._head = b""
+        self._hasher = hashlib.sha256()
+
+    @property
+    def sha256(self):
+        return self._hasher.hexdigest()
+
+    def write(self, data):
+        self.size += len(data)
+
+        if self.kind is None:
+            self._head += data[:SNIFF_BYTES]
+            if len(self._head) >= SNIFF_BYTES:
+                self._check_format(self._head)
+
+        limit = UPLOAD_LIMITS.get(self.kind, max(UPLOAD_LIMITS.values()))
+        if self.size > limit:
+            self.close()
+            raise RequestEntityTooLarge(
+                f"File is too large. The limit for {self.kind or 'this'} uploads is {limit // MB} MB."
+            )
+
+        self._hasher.update(data)
+        return super().write(data)
+
+    def _check_format(self, head):
+        kind = sniff_kind(head)
+        if kind is None or kind != self.expected:
+            self.close()
+            raise UnsupportedMediaType(UNSUPPORTED_MESSAGE)
+        self.kind = kind
+
+    def verify(self):
+        """Final check for uploads that ended before a full sniff window arrived."""
+        if self.kind is None:
+            self._check_format(self._head)
+        return self.kind
+
+
+class GuardedRequest(Request):
+    """Flask request that streams file uploads through a GuardedUpload."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Reject by suffix before a single byte of the file body is read.
+        if filename and expected_kind(filename) is None:
+            raise UnsupportedMediaType(UNSUPPORTED_MESSAGE)
+        return GuardedUpload(filename)